@@ -40,9 +40,11 @@ def get_chrome_driver():
     # Disable automation flags
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    options.page_load_strategy = 'eager'  # Return at DOMContentLoaded; the result grid is DOM-driven
     
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(15)
     
     # Execute CDP commands to hide webdriver
     driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
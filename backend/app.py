@@ -668,20 +668,21 @@ def compare_details():
     
     from scraper import scrape_product_details
     
+    # Scrape every link concurrently; the scraper reuses pooled drivers between pages
+    links = list(dict.fromkeys(
+        p.get(key) for p in products_to_compare for key in ('amazon_link', 'flipkart_link') if p.get(key)
+    ))
+    print(f"[COMPARE] Scraping {len(links)} product pages...")
+    with ThreadPoolExecutor(max_workers=min(len(links), 4) or 1) as executor:
+        specs_by_link = dict(zip(links, executor.map(scrape_product_details, links)))
+    
     results = []
     for p in products_to_compare:
         title = p.get('title', 'Unknown')
-        print(f"[COMPARE] Scraping details for: {title[:50]}...")
-        
-        # Scrape specs from both links if available
-        amazon_specs = {}
-        flipkart_specs = {}
-        
-        if p.get('amazon_link'):
-            amazon_specs = scrape_product_details(p['amazon_link'])
         
-        if p.get('flipkart_link'):
-            flipkart_specs = scrape_product_details(p['flipkart_link'])
+        # Specs from both links if available
+        amazon_specs = specs_by_link.get(p.get('amazon_link'), {})
+        flipkart_specs = specs_by_link.get(p.get('flipkart_link'), {})
         
         # Merge specs (Amazon primary, Flipkart fills gaps)
         merged_specs = {**flipkart_specs, **amazon_specs}
@@ -9,15 +9,26 @@ import time
 import re
 import os
 import math
+import sys
+import hashlib
+import zlib
+import sqlite3
+import platform
+import threading
+import queue
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.edge.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
 from bs4 import BeautifulSoup
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer, util
 
@@ -29,14 +40,88 @@ DEFAULT_MAX_RESULTS = max(8, int(os.getenv("SCRAPER_MAX_RESULTS", "48")))
 DEFAULT_MAX_PAGES = max(1, int(os.getenv("SCRAPER_MAX_PAGES", "2")))
 DEFAULT_PAGE_TIMEOUT_SECONDS = max(4, int(os.getenv("SCRAPER_PAGE_TIMEOUT_SECONDS", "8")))
 DEFAULT_EMBEDDING_MODEL = os.getenv("SCRAPER_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+DEFAULT_ENCODE_BATCH_SIZE = max(1, int(os.getenv("SCRAPER_ENCODE_BATCH_SIZE", "32")))
+CPU_TORCH_THREADS = int(os.getenv("SCRAPER_TORCH_THREADS", "0"))  # 0 = auto
+CPU_INT8_ONNX = os.getenv("SCRAPER_CPU_INT8_ONNX", "true").lower() == "true"
+CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "eshopzz"))
+EMBEDDING_CACHE_ENABLED = os.getenv("SCRAPER_EMBEDDING_CACHE", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.path.join(CACHE_DIR, "embeddings.sqlite3")
+AMAZON_HTTP_FAST_PATH = os.getenv("SCRAPER_AMAZON_HTTP", "true").lower() == "true"
+DEFAULT_HTTP_TIMEOUT_SECONDS = max(1, int(os.getenv("SCRAPER_HTTP_TIMEOUT_SECONDS", "5")))
+# Optional path to a slimmer browser build (e.g. a headless-only binary); default is the installed Edge
+BROWSER_BINARY = os.getenv("SCRAPER_BROWSER_BINARY", "")
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_MODEL_ID = DEFAULT_EMBEDDING_MODEL
+_EMBEDDING_CACHE_DB = None
+_EMBEDDING_CACHE_BROKEN = False  # Set when the cache can't be opened; titles are then always encoded
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+def _detect_device():
+    """Pick the fastest available torch device: CUDA, then Apple MPS, then CPU."""
+    try:
+        if torch.cuda.is_available():
+            return "cuda"
+        if torch.backends.mps.is_available():
+            return "mps"
+    except Exception:
+        pass
+    return "cpu"
+
+def _configure_cpu_threads():
+    """Pin torch's CPU thread pools; the default is often 1 or the host's full core count in containers."""
+    n = CPU_TORCH_THREADS or min(8, max(2, (os.cpu_count() or 2) // 2))
+    torch.set_num_threads(n)
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass  # Can only be set once, before any inter-op parallel work has started
+    print(f"[AI] CPU inference threads: intra-op={n}, inter-op={torch.get_num_interop_threads()}")
+
+def _load_int8_onnx_model(model_name):
+    """
+    Load a dynamically INT8-quantized ONNX Runtime export of the embedding model for CPU inference.
+    The export is built once and cached under CACHE_DIR. Needs sentence-transformers[onnx].
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    quant_config = "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "avx2"
+    file_name = f"onnx/model_qint8_{quant_config}.onnx"
+    export_dir = os.path.join(CACHE_DIR, "onnx", model_name.replace("/", "__"))
+
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        print(f"[AI] Exporting INT8 ONNX model to {export_dir} (first run only)...")
+        onnx_model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        onnx_model.save(export_dir)
+        export_dynamic_quantized_onnx_model(
+            onnx_model, quant_config, export_dir, file_suffix=f"qint8_{quant_config}"
+        )
+
+    return SentenceTransformer(export_dir, device="cpu", backend="onnx", model_kwargs={"file_name": file_name})
 
 def preload_model():
     """Preload the Transformer model at startup for instant matching."""
-    global _MODEL, _MODEL_LOADED
+    global _MODEL, _MODEL_LOADED, _MODEL_ID
     if not _MODEL_LOADED:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
+        device = _detect_device()
         print(f"[AI] Preloading transformer model '{DEFAULT_EMBEDDING_MODEL}' on {device}...")
-        _MODEL = SentenceTransformer(DEFAULT_EMBEDDING_MODEL, device=device)
+        _MODEL = None
+        if device == "cpu":
+            _configure_cpu_threads()
+        if device == "cpu" and CPU_INT8_ONNX:
+            try:
+                _MODEL = _load_int8_onnx_model(DEFAULT_EMBEDDING_MODEL)
+                _MODEL_ID = f"{DEFAULT_EMBEDDING_MODEL}:int8-onnx"
+                device = "cpu (int8 onnx)"
+            except Exception as e:
+                print(f"[AI] INT8 ONNX model unavailable, using PyTorch FP32: {e}")
+        if _MODEL is None:
+            _MODEL = SentenceTransformer(DEFAULT_EMBEDDING_MODEL, device=device)
         # Warm up the model with a dummy encode
         _MODEL.encode(["warmup"], convert_to_tensor=True)
         _MODEL_LOADED = True
@@ -50,6 +135,15 @@ def get_model():
         return preload_model()
     return _MODEL
 
+# Asset and tracker URLs the scrapers never need; blocked over CDP so the browser doesn't fetch them
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*amazon-adsystem.com*",
+]
+
+
 def get_chrome_driver():
     """Configure Chrome with anti-detection settings."""
     options = Options()
@@ -62,11 +156,15 @@ def get_chrome_driver():
     options.add_argument("--log-level=3")
     options.add_argument("--silent")
     options.add_argument("--disable-gpu")
+    # Skip the background services a fresh profile starts (sync, updates, first-run setup)
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-sync")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--no-first-run")
+    options.add_argument("--mute-audio")
     options.add_argument("--window-size=1920,1080")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
+    options.add_argument(f"user-agent={DEFAULT_USER_AGENT}")
     
     # Disable automation flags
     options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
@@ -86,6 +184,8 @@ def get_chrome_driver():
     }
     options.add_experimental_option("prefs", prefs)
     options.page_load_strategy = 'eager'  # Don't wait for full page load
+    if BROWSER_BINARY:
+        options.binary_location = BROWSER_BINARY
     
     try:
         service = Service(log_output=os.devnull)
@@ -103,10 +203,36 @@ def get_chrome_driver():
             Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
         """
     })
+
+    # Images are already off via prefs; also drop fonts and analytics before they hit the network
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        if SCRAPER_VERBOSE:
+            print(f"[DRIVER] Could not set blocked URLs: {e}")
     
     return driver
 
 
+def get_http_session():
+    """Shared requests session so keep-alive connections and TLS handshakes are reused."""
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            session.headers.update({
+                "User-Agent": DEFAULT_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-IN,en;q=0.9",
+            })
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
 def parse_price(price_text):
     """Extract numeric price from text."""
     if not price_text:
@@ -232,7 +358,41 @@ def _extract_amazon_products_from_soup(soup, max_results):
     return products
 
 
+def _scrape_amazon_page_http(query, page, max_results=100):
+    """
+    Fetch an Amazon results page with plain HTTP (no browser).
+    Returns None when the response is a captcha/empty page so the caller can fall back to Selenium.
+    """
+    try:
+        resp = get_http_session().get(
+            "https://www.amazon.in/s",
+            params={"k": query, "page": page},
+            timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
+        )
+    except requests.RequestException as e:
+        if SCRAPER_VERBOSE:
+            print(f"[AMAZON][P{page}][HTTP] error: {e}")
+        return None
+
+    html = resp.text
+    if resp.status_code != 200 or "s-search-result" not in html:
+        if SCRAPER_VERBOSE:
+            print(f"[AMAZON][P{page}][HTTP] blocked or empty (status={resp.status_code}), falling back to browser")
+        return None
+
+    soup = BeautifulSoup(html, 'html.parser')
+    page_products = _extract_amazon_products_from_soup(soup, max_results)
+    if SCRAPER_VERBOSE:
+        print(f"[AMAZON][P{page}][HTTP] parsed={len(page_products)}")
+    return page_products or None
+
+
 def _scrape_amazon_page(query, page, max_results=100, driver=None):
+    if AMAZON_HTTP_FAST_PATH:
+        page_products = _scrape_amazon_page_http(query, page, max_results=max_results)
+        if page_products:
+            return page_products
+
     owns_driver = driver is None
     try:
         if owns_driver:
@@ -280,18 +440,11 @@ def scrape_amazon(query, max_results=None):
     pages = list(range(1, _pages_needed(max_results, per_page=24, max_pages=DEFAULT_MAX_PAGES) + 1))
 
     if len(pages) == 1:
-        # Single page - no parallelism needed
-        driver = None
-        try:
-            driver = get_chrome_driver()
-            products = _scrape_amazon_page(query, 1, max_results=max_results, driver=driver)
-        finally:
-            if driver:
-                try: driver.quit()
-                except: pass
+        # Single page - no parallelism needed (a driver is only started if plain HTTP fails)
+        products = _scrape_amazon_page(query, 1, max_results=max_results)
         return _dedupe_products(products, max_results)
 
-    # Multiple pages - scrape in parallel with separate drivers
+    # Multiple pages - scrape in parallel, each page falls back to its own driver
     all_products = []
     with ThreadPoolExecutor(max_workers=len(pages)) as pool:
         futures = {pool.submit(_scrape_amazon_page, query, p, max_results): p for p in pages}
@@ -306,6 +459,130 @@ def scrape_amazon(query, max_results=None):
     return _dedupe_products(all_products, max_results)
 
 
+def _extract_flipkart_products_from_soup(soup, max_results=100, diagnostics=None):
+    """
+    Parse product cards from a rendered Flipkart search page.
+    Link/title/price counters are written into `diagnostics` when one is passed.
+    """
+    if diagnostics is None:
+        diagnostics = {"candidate_links": 0, "titles_found": 0, "prices_found": 0, "data_id_nodes": 0}
+    products = []
+
+    product_links = soup.find_all('a', href=re.compile(r'/p/'))
+    diagnostics["candidate_links"] = len(product_links)
+    diagnostics["data_id_nodes"] = len(soup.select("div[data-id]"))
+
+    seen_links = set()
+    for a in product_links:
+        href = a.get('href')
+        if not href or href in seen_links:
+            continue
+        if 'Search results' in a.get_text():
+            continue
+
+        title = None
+        text = a.get_text(strip=True)
+        if len(text) > 15:
+            title = text
+        elif a.get('title') and len(a.get('title')) > 15:
+            title = a.get('title')
+        else:
+            for d in a.find_all(['div', 'span']):
+                t = d.get_text(strip=True)
+                if len(t) > 15 and not re.match(r'^(?:\u20b9|rs)', t, re.IGNORECASE) and "OFF" not in t.upper():
+                    title = t
+                    break
+
+        if not title:
+            parent = a.parent
+            if parent:
+                for sibling in parent.find_all(['div', 'a']):
+                    t = sibling.get_text(strip=True)
+                    if len(t) > 15 and not re.match(r'^(?:\u20b9|rs)', t, re.IGNORECASE) and "OFF" not in t.upper():
+                        title = t
+                        break
+
+        if not title:
+            continue
+        diagnostics["titles_found"] += 1
+
+        price = None
+        curr = a
+        for _ in range(6):
+            if not curr or curr.name == 'body':
+                break
+
+            price_texts = curr.find_all(string=re.compile(r'(?:\u20b9|rs\.?)\s*[0-9][0-9,]*', re.IGNORECASE))
+            if not price_texts:
+                price_texts = curr.find_all(string=re.compile(r'[0-9][0-9,]{3,}'))
+
+            if price_texts:
+                for pt in price_texts:
+                    pt_str = str(pt).strip()
+                    parent_classes = ' '.join(pt.parent.get('class', [])).lower()
+                    if 'strikethrough' in parent_classes or 'discount' in parent_classes:
+                        continue
+                    parsed_p = parse_price(pt_str)
+                    if parsed_p and 100 <= parsed_p <= 10000000:
+                        price = parsed_p
+                        break
+
+            if price:
+                diagnostics["prices_found"] += 1
+                break
+            curr = curr.parent
+
+        image = None
+        curr = a
+        for _ in range(4):
+            if not curr or curr.name == 'body':
+                break
+            img_els = curr.find_all('img')
+            for img in img_els:
+                src = img.get('src') or img.get('data-src')
+                if src and ('rukminim' in src or 'http' in src) and not src.endswith('.svg'):
+                    image = src
+                    break
+            if image:
+                break
+            curr = curr.parent
+
+        rating = None
+        curr = a
+        for _ in range(4):
+            if not curr or curr.name == 'body':
+                break
+            rating_blocks = curr.find_all('div')
+            for rb in rating_blocks:
+                t = rb.get_text(strip=True)
+                if re.match(r'^[1-5]\.[0-9]$', t) or re.match(r'^[1-5]$', t):
+                    rating = float(t)
+                    break
+            if rating:
+                break
+            curr = curr.parent
+
+        link = href
+        if link and not link.startswith("http"):
+            link = "https://www.flipkart.com" + link
+
+        if title and price:
+            products.append({
+                "title": title,
+                "price": price,
+                "image": image,
+                "link": link,
+                "rating": rating,
+                "is_prime": False,
+                "source": "flipkart",
+            })
+            seen_links.add(href)
+            if len(products) >= max_results:
+                break
+
+    return products
+
+
 def _scrape_flipkart_page(query, page, max_results=100, driver=None):
     owns_driver = driver is None
     products = []
@@ -355,117 +632,7 @@ def _scrape_flipkart_page(query, page, max_results=100, driver=None):
             if marker in page_text:
                 diagnostics["blocked_signals"].add(marker)
 
-        product_links = soup.find_all('a', href=re.compile(r'/p/'))
-        diagnostics["candidate_links"] = len(product_links)
-        diagnostics["data_id_nodes"] = len(soup.select("div[data-id]"))
-
-        seen_links = set()
-        for a in product_links:
-            href = a.get('href')
-            if not href or href in seen_links:
-                continue
-            if 'Search results' in a.get_text():
-                continue
-
-            title = None
-            text = a.get_text(strip=True)
-            if len(text) > 15:
-                title = text
-            elif a.get('title') and len(a.get('title')) > 15:
-                title = a.get('title')
-            else:
-                for d in a.find_all(['div', 'span']):
-                    t = d.get_text(strip=True)
-                    if len(t) > 15 and not re.match(r'^(?:\u20b9|rs)', t, re.IGNORECASE) and "OFF" not in t.upper():
-                        title = t
-                        break
-
-            if not title:
-                parent = a.parent
-                if parent:
-                    for sibling in parent.find_all(['div', 'a']):
-                        t = sibling.get_text(strip=True)
-                        if len(t) > 15 and not re.match(r'^(?:\u20b9|rs)', t, re.IGNORECASE) and "OFF" not in t.upper():
-                            title = t
-                            break
-
-            if not title:
-                continue
-            diagnostics["titles_found"] += 1
-
-            price = None
-            curr = a
-            for _ in range(6):
-                if not curr or curr.name == 'body':
-                    break
-
-                price_texts = curr.find_all(string=re.compile(r'(?:\u20b9|rs\.?)\s*[0-9][0-9,]*', re.IGNORECASE))
-                if not price_texts:
-                    price_texts = curr.find_all(string=re.compile(r'[0-9][0-9,]{3,}'))
-
-                if price_texts:
-                    for pt in price_texts:
-                        pt_str = str(pt).strip()
-                        parent_classes = ' '.join(pt.parent.get('class', [])).lower()
-                        if 'strikethrough' in parent_classes or 'discount' in parent_classes:
-                            continue
-                        parsed_p = parse_price(pt_str)
-                        if parsed_p and 100 <= parsed_p <= 10000000:
-                            price = parsed_p
-                            break
-
-                if price:
-                    diagnostics["prices_found"] += 1
-                    break
-                curr = curr.parent
-
-            image = None
-            curr = a
-            for _ in range(4):
-                if not curr or curr.name == 'body':
-                    break
-                img_els = curr.find_all('img')
-                for img in img_els:
-                    src = img.get('src') or img.get('data-src')
-                    if src and ('rukminim' in src or 'http' in src) and not src.endswith('.svg'):
-                        image = src
-                        break
-                if image:
-                    break
-                curr = curr.parent
-
-            rating = None
-            curr = a
-            for _ in range(4):
-                if not curr or curr.name == 'body':
-                    break
-                rating_blocks = curr.find_all('div')
-                for rb in rating_blocks:
-                    t = rb.get_text(strip=True)
-                    if re.match(r'^[1-5]\.[0-9]$', t) or re.match(r'^[1-5]$', t):
-                        rating = float(t)
-                        break
-                if rating:
-                    break
-                curr = curr.parent
-
-            link = href
-            if link and not link.startswith("http"):
-                link = "https://www.flipkart.com" + link
-
-            if title and price:
-                products.append({
-                    "title": title,
-                    "price": price,
-                    "image": image,
-                    "link": link,
-                    "rating": rating,
-                    "is_prime": False,
-                    "source": "flipkart",
-                })
-                seen_links.add(href)
-                if len(products) >= max_results:
-                    break
+        products = _extract_flipkart_products_from_soup(soup, max_results, diagnostics)
 
         if SCRAPER_VERBOSE or len(products) == 0:
             print(
@@ -584,45 +751,177 @@ SUPPORTED_BRANDS = [
 ]
 STRICT_VARIANTS = {'pro', 'plus', 'max', 'ultra', 'mini', 'air', 'lite', 'fe', 'promax'}
 
-def normalize_title(title):
-    """Normalize title for better matching."""
-    if not title:
-        return ""
-    title = title.lower()
-    
-    # Remove symbols that confuse embeddings
-    title = re.sub(r'[()\[\]|\-,]', ' ', title)
-    
-    # Standardize units (GB vs G.B vs GB.)
-    title = re.sub(r'(\d+)\s*(?:gb|g\.b|gb\.)', r'\1gb', title)
-    title = re.sub(r'(\d+)\s*(?:tb|t\.b|tb\.)', r'\1tb', title)
-    
-    # Remove common noise words/marketing fluff
-    noise_words = {
-        'with', 'and', 'the', 'for', 'new', 'latest', 'mobile', 'phone', 
-        'smartphone', 'works', 'camera', 'control', 'chip', 'boost', 
-        'battery', 'life', 'display', '5g', '4g', 'lte', 'india', 'buy', 
-        'online', 'best', 'price', 'low', 'guarantee', 'warranty', 'available',
-        'fast', 'delivery', 'shipping', 'original', 'genuine'
-    }
-    
-    words = title.split()
-    filtered = [w for w in words if w not in noise_words and len(w) > 1]
-    return ' '.join(filtered)
+# Appliance Model Names (Critical for kitchen appliances)
+APPLIANCE_MODELS = [
+    # Prestige models
+    'apex', 'iris', 'popular', 'deluxe', 'teon', 'nakshatra', 'omega', 'manttra',
+    # Philips models
+    'viva', 'daily', 'avance',
+    # Bajaj models
+    'gx', 'twister', 'classic', 'bravo', 'platini',
+    # Butterfly models
+    'jet', 'hero', 'matchless', 'desire', 'splendid',
+    # Preethi models
+    'zodiac', 'blue leaf', 'eco', 'peppy',
+    # Generic appliance terms
+    'juicer', 'blender', 'chopper', 'grinder', 'mixer'
+]
+# Colors (important for clothing and gadgets)
+COLORS = ['black', 'white', 'silver', 'gold', 'blue', 'red', 'green', 'yellow', 'pink', 'purple', 'orange', 'grey', 'gray', 'brown', 'multicolor']
+VARIANTS = ['pro', 'max', 'plus', 'ultra', 'mini', 'air', 'lite', 'fe', 'promax', 'v2', 'gen', 'generation']
+# Series (TVs, Laptops, etc.) - Crucial for avoiding Series mismatches
+SERIES_WORDS = [
+    'fx', 'webos', 'tizen', 'thinkpad', 'zenbook', 'vivobook', 'rog', 'tuf', 'aliware',
+    'inspiron', 'vostro', 'latitude', 'xps', 'ideapad', 'legion', 'yoga', 'pavilion',
+    'envy', 'spectre', 'omen'
+]
+# Series names whose words may be split by whitespace ("x series" / "xseries")
+_SERIES_PATTERNS = [re.compile(p) for p in (
+    r'\bx\s*series\b', r'\ba\s*series\b', r'\bf\s*series\b', r'\bg\s*series\b',
+    r'\bfire\s*tv\b', r'\bgoogle\s*tv\b', r'\bandroid\s*tv\b',
+    r'\bmacbook\s*air\b', r'\bmacbook\s*pro\b',
+)]
+
+
+def _build_vocabulary_tables():
+    """
+    Map every vocabulary word (brands, appliance models, colors, variants, series)
+    to the identifiers it contributes, so a title is matched with one set
+    intersection instead of one regex search per word. Multi-word entries keep
+    a compiled pattern.
+    """
+    token_table = {}
+    phrase_table = []
+
+    def register(word, *idents):
+        if ' ' in word:
+            phrase_table.append((re.compile(r'\b' + re.escape(word) + r'\b'), idents))
+        else:
+            existing = token_table.get(word, ())
+            token_table[word] = existing + tuple(i for i in idents if i not in existing)
+
+    for brand in SUPPORTED_BRANDS:
+        register(brand, brand)
+    for model in APPLIANCE_MODELS:
+        register(model, 'appmodel_' + model)
+    for color in COLORS:
+        register(color, 'color_' + color)
+    for variant in VARIANTS:
+        register(variant, variant, 'variant_' + variant)
+    register('promax', 'pro', 'max', 'variant_pro', 'variant_max')
+    for series in SERIES_WORDS:
+        register(series, 'series_' + series)
+
+    return token_table, phrase_table
+
+
+_TOKEN_IDENTIFIERS, _PHRASE_IDENTIFIERS = _build_vocabulary_tables()
+_VOCABULARY = frozenset(_TOKEN_IDENTIFIERS)
+_WORD_RE = re.compile(r'\w+')
+
+# Identifier patterns, compiled once at import instead of per title
+_SIZE_RE = re.compile(r'(\d{2,3})\s*(?:inch|cm|\"|\')')
+_CM_TO_INCH = {80: 32, 108: 43, 109: 43, 126: 50, 138: 55, 139: 55, 164: 65, 189: 75}
+_STORAGE_RE = re.compile(r'(\d+)\s*(gb|tb)')
+_RESOLUTION_MAP = (
+    ('4k', '4k'), ('uhd', '4k'), ('ultra hd', '4k'), ('2160p', '4k'),
+    ('full hd', 'fhd'), ('fhd', 'fhd'), ('1080p', 'fhd'),
+    ('hd ready', 'hd'), ('720p', 'hd'),
+)
+_PANELS = ('qled', 'oled', 'led', 'lcd')
+_WATT_RE = re.compile(r'(\d+)\s*(?:watt|w)\b')
+_JAR_RE = re.compile(r'(\d+)\s*(?:jar|jars)\b')
+_QTY_PATTERNS = tuple(re.compile(p) for p in (
+    r'\bpack\s*of\s*(\d+)\b',
+    r'\bset\s*of\s*(\d+)\b',
+    r'(\d+)\s*(?:kg|gram|gm|ml|ltr|litre|pounds|lbs)\b',
+    r'(\d+)\s*piece(?:s)?\b',
+))
+_MODEL_SPLIT_RE = re.compile(r'[\s/]+')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+_MODEL_STOPWORDS = frozenset(['pack', 'inch', 'with', 'from', 'best', 'india', '500ml', 'gen1', 'gen2', 'gen3'])
+_PHONE_MODEL_PATTERNS = tuple(re.compile(p) for p in (
+    r'iphone\s*(\d+)(?:\s*(pro|plus|max))?',
+    r's(\d+)(?:\s*(ultra|plus|\+))?',
+    r'galaxy\s*(\w+)',
+    r'(\d+)\s*pro',
+    r'nord\s*(\w+)',
+))
+_IPHONE_GEN_RE = re.compile(r'\biphone\s*(\d{1,2})\b')
+
+
+_SUPPORTED_BRAND_SET = frozenset(map(sys.intern, SUPPORTED_BRANDS))
+_MOBILE_BRANDS = frozenset(map(sys.intern, ('apple', 'samsung', 'oneplus', 'xiaomi', 'redmi', 'realme', 'oppo', 'vivo', 'poco', 'motorola')))
+_FLAG_ACC = frozenset(map(sys.intern, ('flag_accessory', 'flag_main_product')))
+_FLAG_REF = frozenset(map(sys.intern, ('flag_refurbished', 'flag_new')))
+_RESOLUTIONS = frozenset(map(sys.intern, ('4k', 'fhd', 'hd')))
+
+# Identifier families used by the matcher's vetoes and bonuses
+_IDENTIFIER_FAMILIES = {
+    'flags_acc': lambda x: x in _FLAG_ACC,
+    'flags_ref': lambda x: x in _FLAG_REF,
+    'brands': lambda x: x in _SUPPORTED_BRAND_SET,
+    'mobile_brands': lambda x: x in _MOBILE_BRANDS,
+    'families': lambda x: x.startswith('brandfamily_'),
+    'storage': lambda x: x.startswith('storage_'),
+    'units': lambda x: x.startswith('unit_'),
+    'sizes': lambda x: x.endswith('inch'),
+    'res': lambda x: x in _RESOLUTIONS,
+    'watt': lambda x: x.startswith('watt_'),
+    'jars': lambda x: x.startswith('jars_'),
+    'series': lambda x: x.startswith('series_'),
+    'strict_variants': lambda x: x.startswith('variant_') and x[len('variant_'):] in STRICT_VARIANTS,
+    'iphone_gen': lambda x: x.startswith('iphone_gen_'),
+    'models': lambda x: x.startswith('model_'),
+    'colors': lambda x: x.startswith('color_'),
+}
+
+# Identifiers of one title, grouped by family once at extraction time.
+# brand_bloom is a 64-bit Bloom fingerprint of brands | families: if two fingerprints
+# share no bit, the titles share no brand and no brand family.
+Idents = namedtuple('Idents', ['all', *_IDENTIFIER_FAMILIES, 'brand_bloom'])
+
+
+def _brand_bloom(tokens):
+    bloom = 0
+    for token in tokens:
+        bloom |= 1 << (zlib.crc32(token.encode("utf-8")) & 63)
+    return bloom
+
+
+def _group_identifiers(identifiers):
+    groups = [
+        frozenset(x for x in identifiers if in_family(x)) for in_family in _IDENTIFIER_FAMILIES.values()
+    ]
+    by_name = dict(zip(_IDENTIFIER_FAMILIES, groups))
+    return Idents(identifiers, *groups, _brand_bloom(by_name['brands'] | by_name['families']))
+
+
+_EMPTY_IDENTS = _group_identifiers(frozenset())
 
 
 def extract_key_identifiers(title):
-    """Extract key product identifiers like brand, model, size, storage."""
+    """
+    Extract key product identifiers like brand, model, size, storage.
+    Returns an Idents tuple: `all` is a frozenset of interned strings (so repeated
+    set algebra in the matcher reuses cached hashes) and every other field is that
+    set's subset for one family in _IDENTIFIER_FAMILIES.
+    """
     if not title:
-        return set()
+        return _EMPTY_IDENTS
     
     title_lower = title.lower()
     identifiers = set()
     
-    # Extract brand names
-    for brand in SUPPORTED_BRANDS:
-        if re.search(r'\b' + re.escape(brand) + r'\b', title_lower):
-            identifiers.add(brand)
+    # Whole-word tokens: a word is in this set exactly where r'\bword\b' would match
+    tokens = set(_WORD_RE.findall(title_lower))
+
+    # Extract vocabulary words (brands, appliance models, colors, variants, series)
+    for token in tokens & _VOCABULARY:
+        identifiers.update(_TOKEN_IDENTIFIERS[token])
+    for pattern, hits in _PHRASE_IDENTIFIERS:
+        if pattern.search(title_lower):
+            identifiers.update(hits)
             
     # Brand Families (for grouping)
     if any(b in identifiers for b in ['iphone', 'macbook', 'ipad', 'apple']):
@@ -645,21 +944,20 @@ def extract_key_identifiers(title):
     
     # Extract screen sizes for TVs/Monitors (e.g., 32 inch, 43 inch, 55", 80cm)
     # Using word boundaries and specific patterns to avoid catching other numbers
-    size_match = re.search(r'(\d{2,3})\s*(?:inch|cm|\"|\')', title_lower)
+    size_match = _SIZE_RE.search(title_lower)
     if size_match:
         val = int(size_match.group(1))
         unit = size_match.group(0).lower()
         if 'cm' in unit:
             # Standardize common cm to inch mappings to avoid rounding errors
-            cm_to_inch = {80: 32, 108: 43, 109: 43, 126: 50, 138: 55, 139: 55, 164: 65, 189: 75}
-            inch = cm_to_inch.get(val, round(val / 2.54))
+            inch = _CM_TO_INCH.get(val, round(val / 2.54))
             identifiers.add(f"{inch}inch")
         else:
             identifiers.add(f"{val}inch")
     
     # Extract storage/RAM sizes (e.g., 8GB RAM, 128GB Storage, 1TB)
     storage_candidates = []
-    for match in re.finditer(r'(\d+)\s*(gb|tb)', title_lower):
+    for match in _STORAGE_RE.finditer(title_lower):
         val = int(match.group(1))
         unit = match.group(2)
         token = f"{val}{unit}"
@@ -684,174 +982,90 @@ def extract_key_identifiers(title):
         identifiers.add(f"storage_{best[2]}")
     
     # Extract resolution types - more robust matching
-    res_map = {
-        '4k': '4k', 'uhd': '4k', 'ultra hd': '4k', '2160p': '4k',
-        'full hd': 'fhd', 'fhd': 'fhd', '1080p': 'fhd',
-        'hd ready': 'hd', '720p': 'hd'
-    }
-    for res_str, res_id in res_map.items():
+    for res_str, res_id in _RESOLUTION_MAP:
         if res_str in title_lower:
             identifiers.add(res_id)
     
     # Special check for generic "HD" which is often used for 720p/HD Ready
-    if 'hd' not in identifiers and re.search(r'\bhd\b', title_lower):
+    if 'hd' not in identifiers and 'hd' in tokens:
         if 'fhd' not in identifiers and '4k' not in identifiers:
             identifiers.add('hd')
     
     # Panel types
-    panels = ['qled', 'oled', 'led', 'lcd']
-    for panel in panels:
+    for panel in _PANELS:
         if panel in title_lower:
             identifiers.add(panel)
     
     # --- Wattage for Appliances (Mixers, Grinders, etc.) ---
-    watt_match = re.search(r'(\d+)\s*(?:watt|w)\b', title_lower)
+    watt_match = _WATT_RE.search(title_lower)
     if watt_match:
         identifiers.add('watt_' + watt_match.group(1))
     
-    # --- Appliance Model Names (Critical for kitchen appliances) ---
-    appliance_models = [
-        # Prestige models
-        'apex', 'iris', 'popular', 'deluxe', 'teon', 'nakshatra', 'omega', 'manttra',
-        # Philips models
-        'viva', 'daily', 'avance',
-        # Bajaj models
-        'gx', 'twister', 'classic', 'bravo', 'platini',
-        # Butterfly models
-        'jet', 'hero', 'matchless', 'desire', 'splendid',
-        # Preethi models
-        'zodiac', 'blue leaf', 'eco', 'peppy',
-        # Generic appliance terms
-        'juicer', 'blender', 'chopper', 'grinder', 'mixer'
-    ]
-    for model in appliance_models:
-        if re.search(r'\b' + model + r'\b', title_lower):
-            identifiers.add('appmodel_' + model)
-    
     # --- Jar Count for Mixers ---
-    jar_match = re.search(r'(\d+)\s*(?:jar|jars)\b', title_lower)
+    jar_match = _JAR_RE.search(title_lower)
     if jar_match:
         identifiers.add('jars_' + jar_match.group(1))
             
     # --- New General Identifiers ---
     
-    # Colors (important for clothing and gadgets)
-    colors = ['black', 'white', 'silver', 'gold', 'blue', 'red', 'green', 'yellow', 'pink', 'purple', 'orange', 'grey', 'gray', 'brown', 'multicolor']
-    for color in colors:
-        if re.search(r'\b' + color + r'\b', title_lower):
-            identifiers.add('color_' + color)
-            
     # Quantity / Pack Size (e.g., "Pack of 2", "Set of 3", "2kg", "500ml")
-    qty_patterns = [
-        r'\bpack\s*of\s*(\d+)\b',
-        r'\bset\s*of\s*(\d+)\b',
-        r'(\d+)\s*(?:kg|gram|gm|ml|ltr|litre|pounds|lbs)\b',
-        r'(\d+)\s*piece(?:s)?\b',
-    ]
-    for pattern in qty_patterns:
-        match = re.search(pattern, title_lower)
+    for pattern in _QTY_PATTERNS:
+        match = pattern.search(title_lower)
         if match:
             # Add a 'unit_' prefix to differentiate from screen sizes or storage
             identifiers.add('unit_' + match.group(0).replace(' ', ''))
             
     # Alphanumeric Model Numbers (e.g., SM-G991B, WH-1000XM4, B07XJ8C8F5)
     # Improved to be hyphen-tolerant and catch mixed clusters
-    tokens = re.split(r'[\s/]+', title_lower)
+    tokens = _MODEL_SPLIT_RE.split(title_lower)
     for token in tokens:
         clean_token = token.strip('(),.[]"\'')
         if len(clean_token) >= 4 and any(c.isdigit() for c in clean_token) and any(c.isalpha() for c in clean_token):
              # Normalize: remove non-alphanumeric chars for matching
-             norm = re.sub(r'[^a-z0-9]', '', clean_token)
-             if len(norm) >= 4 and norm not in ['pack', 'inch', 'with', 'from', 'best', 'india', '500ml', 'gen1', 'gen2', 'gen3']:
+             norm = _NON_ALNUM_RE.sub('', clean_token)
+             if len(norm) >= 4 and norm not in _MODEL_STOPWORDS:
                  identifiers.add('model_' + norm)
             
-    # Variants (moved down and expanded)
-    variants = ['pro', 'max', 'plus', 'ultra', 'mini', 'air', 'lite', 'fe', 'promax', 'v2', 'gen', 'generation']
-    for variant in variants:
-        if re.search(r'\b' + variant + r'\b', title_lower):
-            identifiers.add(variant)
-            identifiers.add('variant_' + variant)
-            if variant == 'promax':
-                identifiers.add('pro')
-                identifiers.add('max')
-                identifiers.add('variant_pro')
-                identifiers.add('variant_max')
-    
-    # Extract Series (TVs, Laptops, etc.) - Crucial for avoiding Series mismatches
-    series_patterns = [
-        r'\bfx\b', r'\bx\s*series\b', r'\ba\s*series\b', r'\bf\s*series\b', 
-        r'\bg\s*series\b', r'\bfire\s*tv\b', r'\bgoogle\s*tv\b', 
-        r'\bandroid\s*tv\b', r'\bwebos\b', r'\btizen\b',
-        r'\bmacbook\s*air\b', r'\bmacbook\s*pro\b', r'\bthinkpad\b', 
-        r'\bzenbook\b', r'\bvivobook\b', r'\brog\b', r'\btuf\b', r'\baliware\b',
-        r'\binspiron\b', r'\bvostro\b', r'\blatitude\b', r'\bxps\b',
-        r'\bideapad\b', r'\blegion\b', r'\byoga\b', r'\bpavilion\b', r'\benvy\b', r'\bspectre\b', r'\bomen\b'
-    ]
-    for pattern in series_patterns:
-        match = re.search(pattern, title_lower)
+    # Extract multi-word Series (single-word series come from the vocabulary scan)
+    for pattern in _SERIES_PATTERNS:
+        match = pattern.search(title_lower)
         if match:
             identifiers.add('series_' + match.group(0).replace(' ', ''))
             
     # Extract phone model patterns
-    model_patterns = [
-        r'iphone\s*(\d+)(?:\s*(pro|plus|max))?',
-        r's(\d+)(?:\s*(ultra|plus|\+))?',
-        r'galaxy\s*(\w+)',
-        r'(\d+)\s*pro',
-        r'nord\s*(\w+)',
-    ]
-    for pattern in model_patterns:
-        match = re.search(pattern, title_lower)
+    for pattern in _PHONE_MODEL_PATTERNS:
+        match = pattern.search(title_lower)
         if match:
             model_token = match.group(0).replace(' ', '')
             identifiers.add(model_token)
             identifiers.add('model_' + model_token)
 
     # Explicit iPhone generation token (helps prevent Air vs 17 Pro mismatches)
-    iphone_gen_match = re.search(r'\biphone\s*(\d{1,2})\b', title_lower)
+    iphone_gen_match = _IPHONE_GEN_RE.search(title_lower)
     if iphone_gen_match:
         identifiers.add(f"iphone_gen_{iphone_gen_match.group(1)}")
     
-    return identifiers
+    return _group_identifiers(frozenset(map(sys.intern, identifiers)))
 
 
 def _has_hard_match_conflict(amz_ids, fk_ids):
     """Reject clearly incompatible pairs even if semantic/API score is high."""
-    amz_brands = {
-        x for x in amz_ids
-        if not x.startswith((
-            'brandfamily_', 'flag_', 'unit_', 'watt_', 'jars_', 'appmodel_',
-            'storage_', 'ram_', 'series_', 'model_', 'color_', 'variant_', 'iphone_gen_'
-        )) and x in SUPPORTED_BRANDS
-    }
-    fk_brands = {
-        x for x in fk_ids
-        if not x.startswith((
-            'brandfamily_', 'flag_', 'unit_', 'watt_', 'jars_', 'appmodel_',
-            'storage_', 'ram_', 'series_', 'model_', 'color_', 'variant_', 'iphone_gen_'
-        )) and x in SUPPORTED_BRANDS
-    }
-    if amz_brands and fk_brands and not amz_brands.intersection(fk_brands):
-        amz_families = {x for x in amz_ids if x.startswith('brandfamily_')}
-        fk_families = {x for x in fk_ids if x.startswith('brandfamily_')}
-        if not amz_families.intersection(fk_families):
+    if amz_ids.brands and fk_ids.brands:
+        # Disjoint Bloom fingerprints prove a brand conflict with one AND; only a
+        # possible overlap falls through to the exact set checks
+        if not amz_ids.brand_bloom & fk_ids.brand_bloom:
+            return True
+        if not amz_ids.brands.intersection(fk_ids.brands) and not amz_ids.families.intersection(fk_ids.families):
             return True
 
-    amz_storage = {x for x in amz_ids if x.startswith('storage_')}
-    fk_storage = {x for x in fk_ids if x.startswith('storage_')}
-    if amz_storage and fk_storage and amz_storage != fk_storage:
+    if amz_ids.storage and fk_ids.storage and amz_ids.storage != fk_ids.storage:
         return True
 
-    amz_variants = {x.replace('variant_', '') for x in amz_ids if x.startswith('variant_')}
-    fk_variants = {x.replace('variant_', '') for x in fk_ids if x.startswith('variant_')}
-    amz_strict_variants = amz_variants.intersection(STRICT_VARIANTS)
-    fk_strict_variants = fk_variants.intersection(STRICT_VARIANTS)
-    if amz_strict_variants and fk_strict_variants and not amz_strict_variants.intersection(fk_strict_variants):
+    if (amz_ids.strict_variants and fk_ids.strict_variants
+            and not amz_ids.strict_variants.intersection(fk_ids.strict_variants)):
         return True
 
-    amz_iphone_gen = {x for x in amz_ids if x.startswith('iphone_gen_')}
-    fk_iphone_gen = {x for x in fk_ids if x.startswith('iphone_gen_')}
-    if amz_iphone_gen and fk_iphone_gen and amz_iphone_gen != fk_iphone_gen:
+    if amz_ids.iphone_gen and fk_ids.iphone_gen and amz_ids.iphone_gen != fk_ids.iphone_gen:
         return True
 
     return False
@@ -985,10 +1199,10 @@ def _match_products_lightweight(amazon_products, flipkart_products):
             if _has_hard_match_conflict(amz["ids"], fk["ids"]):
                 continue
 
-            union = amz["ids"] | fk["ids"]
-            overlap = amz["ids"] & fk["ids"]
+            union = amz["ids"].all | fk["ids"].all
+            overlap = amz["ids"].all & fk["ids"].all
             jacc = (len(overlap) / len(union)) if union else 0.0
-            brand_bonus = 0.1 if any(x in SUPPORTED_BRANDS for x in overlap) else 0.0
+            brand_bonus = 0.1 if not overlap.isdisjoint(_SUPPORTED_BRAND_SET) else 0.0
             score = jacc + brand_bonus
             if score > best_score:
                 best_score = score
@@ -1037,6 +1251,249 @@ def _match_products_lightweight(amazon_products, flipkart_products):
     return sorted_products
 
 
+def _int_to_words(value, words):
+    """Split a Python int bitset into `words` little-endian uint64 words."""
+    return [(value >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(words)]
+
+
+def _build_identifier_masks(amz_ids_list, fk_ids_list):
+    """
+    Pack Idents into uint64 bitmasks of shape (N, words).
+    Bits are assigned per call to every identifier seen on either side, and each
+    family in _IDENTIFIER_FAMILIES gets a (words,) mask selecting its bits, so
+    `masks & family_masks[name]` is the product's identifiers in that family.
+    """
+    bit_of = {}
+    family_bits = dict.fromkeys(_IDENTIFIER_FAMILIES, 0)
+    for ids in amz_ids_list + fk_ids_list:
+        for ident in ids.all:
+            if ident not in bit_of:
+                bit_of[ident] = len(bit_of)
+        # Family membership was classified at extraction time
+        for name in _IDENTIFIER_FAMILIES:
+            for ident in getattr(ids, name):
+                family_bits[name] |= 1 << bit_of[ident]
+    words = max(1, (len(bit_of) + 63) // 64)
+    family_masks = {
+        name: np.array(_int_to_words(bits, words), dtype=np.uint64)
+        for name, bits in family_bits.items()
+    }
+
+    def pack(ids_list):
+        rows = []
+        for ids in ids_list:
+            bits = 0
+            for ident in ids.all:
+                bits |= 1 << bit_of[ident]
+            rows.append(_int_to_words(bits, words))
+        return np.array(rows, dtype=np.uint64).reshape(len(ids_list), words)
+
+    return pack(amz_ids_list), pack(fk_ids_list), family_masks
+
+
+def _popcount(masks):
+    """Number of set bits per row of a (..., W) uint64 array."""
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(masks).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(masks.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+# Every confidence level in _score_candidate_pairs needs semantic > this
+_SEMANTIC_FLOOR = 0.4
+
+
+def _score_candidate_pairs(amz_masks, fk_masks, family_masks, semantic):
+    """
+    Vectorized veto + scoring over the full Amazon x Flipkart grid.
+    Returns (scores, valid), both shaped (A, F); pairs hit by any veto or not
+    reaching a confidence level are False in `valid`.
+    """
+    # Pairwise AND / XOR of the full masks are built once; every family test below is a
+    # masked reduction over these two instead of its own (A, F, W) broadcast
+    shared = amz_masks[:, None, :] & fk_masks[None, :, :]
+    differ = amz_masks[:, None, :] ^ fk_masks[None, :, :]
+    amz_has = {name: (amz_masks & mask).any(axis=1) for name, mask in family_masks.items()}
+    fk_has = {name: (fk_masks & mask).any(axis=1) for name, mask in family_masks.items()}
+
+    def both(name):
+        return amz_has[name][:, None] & fk_has[name][None, :]
+
+    def intersects(name):
+        return (shared & family_masks[name]).any(axis=2)
+
+    def differs(name):
+        return (differ & family_masks[name]).any(axis=2)
+
+    def conflicts(name):
+        # Both sets non-empty and not equal
+        return both(name) & differs(name)
+
+    # Determine Category (per Amazon product)
+    is_tv = amz_has['sizes'] | amz_has['res']
+    is_mobile = amz_has['storage'] & amz_has['mobile_brands']
+    is_appliance = ~is_tv & ~is_mobile & (amz_has['watt'] | amz_has['jars'])
+
+    # --- VETO LOGIC (100% Fatal Conflicts) ---
+    # 1. Accessory vs Main Product and 2. Refurbished vs New (sets must be equal, even if empty)
+    veto = differs('flags_acc')
+    veto |= differs('flags_ref')
+
+    # 3. Brand Conflict (unless the brands share a family, e.g. Mi belongs to Xiaomi)
+    brand_match = intersects('brands')
+    veto |= both('brands') & ~brand_match & ~intersects('families')
+
+    # 4. Storage, 5. Quantity/Unit, 7. Series and 9. iPhone generation conflicts
+    for name in ('storage', 'units', 'series', 'iphone_gen'):
+        veto |= conflicts(name)
+
+    # 6. Category Specific Vetoes
+    veto |= is_tv[:, None] & (conflicts('sizes') | conflicts('res'))
+    veto |= is_appliance[:, None] & (conflicts('watt') | conflicts('jars'))
+
+    # 8. Strict variant conflict (especially important for phones/laptops)
+    veto |= both('strict_variants') & ~intersects('strict_variants')
+
+    # --- DYNAMIC SCORING (accumulated in place) ---
+    overlap_count = _popcount(shared)
+    model_match = intersects('models')
+
+    scores = overlap_count * 0.05
+    scores += semantic
+    np.add(scores, 0.15, out=scores, where=brand_match)
+    np.add(scores, 0.4, out=scores, where=model_match)  # Significant boost
+    np.subtract(scores, 0.2, out=scores, where=conflicts('colors'))  # Penalty, not a veto
+
+    # Level 1: model match, Level 2: high overlap + decent semantic, Level 3: pure semantic
+    confident = semantic > 0.82
+    confident |= model_match & (semantic > _SEMANTIC_FLOOR)
+    confident |= brand_match & (overlap_count >= 4) & (semantic > 0.55)
+    confident &= ~veto
+    return scores, confident
+
+
+def _embedding_cache():
+    """Lazily open the on-disk embedding cache (one sqlite connection shared under a lock)."""
+    global _EMBEDDING_CACHE_DB, _EMBEDDING_CACHE_BROKEN
+    if _EMBEDDING_CACHE_DB is None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            db = sqlite3.connect(EMBEDDING_CACHE_PATH, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        except (sqlite3.Error, OSError):
+            # Don't retry on every search; the rest of this process encodes without the cache
+            _EMBEDDING_CACHE_BROKEN = True
+            raise
+        _EMBEDDING_CACHE_DB = db
+    return _EMBEDDING_CACHE_DB
+
+
+def _embedding_key(title):
+    return hashlib.blake2b(f"{_MODEL_ID}\0{title}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _encode_titles(model, titles):
+    """
+    Encode titles into an embedding tensor (rows in input order).
+    Repeated titles (e.g. the same listing on both sites) are encoded once.
+    """
+    unique_titles = list(dict.fromkeys(titles))
+    embeddings = _encode_unique_titles(model, unique_titles)
+    if len(unique_titles) == len(titles):
+        return embeddings
+    positions = {title: i for i, title in enumerate(unique_titles)}
+    return embeddings[[positions[title] for title in titles]]
+
+
+def _encode_unique_titles(model, titles):
+    """
+    Encode distinct titles into an embedding tensor (rows in input order).
+    SentenceTransformer.encode already sorts inputs by length and pads per
+    mini-batch ("smart batching"), then restores the original order, so titles
+    are passed straight through rather than pre-sorted here.
+    Vectors are cached on disk as fp16 keyed by model + title hash; only cache
+    misses are sent to the model.
+    """
+    if not EMBEDDING_CACHE_ENABLED or _EMBEDDING_CACHE_BROKEN:
+        return model.encode(
+            titles,
+            batch_size=DEFAULT_ENCODE_BATCH_SIZE,
+            convert_to_tensor=True,
+            show_progress_bar=False,
+        )
+
+    keys = [_embedding_key(t) for t in titles]
+    cached = {}
+    try:
+        with _EMBEDDING_CACHE_LOCK:
+            placeholders = ",".join("?" * len(keys))
+            rows = _embedding_cache().execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        cached = {key: np.frombuffer(blob, dtype=np.float16) for key, blob in rows}
+    except (sqlite3.Error, OSError) as e:
+        print(f"[AI] Embedding cache read failed: {e}")
+
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        fresh = model.encode(
+            [titles[i] for i in missing],
+            batch_size=DEFAULT_ENCODE_BATCH_SIZE,
+            convert_to_tensor=True,
+            show_progress_bar=False,
+        ).float().cpu().numpy().astype(np.float16)
+        for i, vector in zip(missing, fresh):
+            cached[keys[i]] = vector
+        if not _EMBEDDING_CACHE_BROKEN:
+            try:
+                with _EMBEDDING_CACHE_LOCK:
+                    db = _embedding_cache()
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [(keys[i], vector.tobytes()) for i, vector in zip(missing, fresh)],
+                    )
+                    db.commit()
+            except (sqlite3.Error, OSError) as e:
+                print(f"[AI] Embedding cache write failed: {e}")
+
+    if SCRAPER_VERBOSE:
+        print(f"[AI] Embedding cache: {len(titles) - len(missing)} hits, {len(missing)} misses")
+    # Fresh vectors go through the same fp16 rounding as cached ones, so warm and cold runs agree
+    embeddings = np.stack([cached[key] for key in keys]).astype(np.float32)
+    return torch.from_numpy(embeddings).to(model.device)
+
+
+def _cosine_matrix(a, b):
+    """
+    Cosine similarity of every row of `a` against every row of `b`.
+    On CUDA the normalized embeddings are multiplied in fp16 (tensor cores, half the
+    memory traffic); encoding itself stays fp32. Elsewhere falls back to util.cos_sim.
+    """
+    if a.is_cuda and b.is_cuda:
+        a = torch.nn.functional.normalize(a, dim=1).half()
+        b = torch.nn.functional.normalize(b, dim=1).half()
+        return (a @ b.T).float()
+    return util.cos_sim(a, b)
+
+
+def _assign_pairs(scores, valid):
+    """
+    Pick 1-to-1 matches by repeatedly taking the highest-scoring remaining valid pair
+    and retiring its row and column. Unlike walking Amazon products in list order,
+    a strong pair can't be taken by an earlier, weaker candidate.
+    Returns {amazon_row: (flipkart_col, score)}.
+    """
+    grid = np.where(valid & (scores > 0), scores, -np.inf)
+    assignments = {}
+    while grid.size:
+        i, j = np.unravel_index(int(np.argmax(grid)), grid.shape)
+        if grid[i, j] == -np.inf:
+            break
+        assignments[int(i)] = (int(j), float(grid[i, j]))
+        grid[i, :] = -np.inf
+        grid[:, j] = -np.inf
+    return assignments
+
+
 def match_products(amazon_products, flipkart_products):
     """
     Match similar products from Amazon and Flipkart.
@@ -1086,189 +1543,60 @@ def match_products(amazon_products, flipkart_products):
     # Initialize AI Model
     model = get_model()
     
-    # 1. Pre-calculate Amazon Identifiers and Embeddings
+    # 1. Encode both platforms' titles in one fused batch on a worker thread
+    # (torch releases the GIL), while identifiers are extracted here
     amz_titles = [p['title'] for p in amazon_products]
-    print(f"[AI] Encoding {len(amz_titles)} Amazon products...")
-    amz_embeddings = model.encode(amz_titles, convert_to_tensor=True, show_progress_bar=False)
-    
-    amz_data = []
-    for idx, amz_p in enumerate(amazon_products):
-        amz_data.append({
-            'p': amz_p,
-            'embedding': amz_embeddings[idx],
-            'identifiers': extract_key_identifiers(amz_p['title']),
-            'words': set(normalize_title(amz_p['title']).split())
-        })
-
-    # 2. Pre-calculate Flipkart Identifiers and Embeddings
     fk_titles = [p['title'] for p in flipkart_products]
-    print(f"[AI] Encoding {len(fk_titles)} Flipkart products...")
-    fk_embeddings = model.encode(fk_titles, convert_to_tensor=True, show_progress_bar=False)
-    
-    fk_data = []
-    for idx, fk_p in enumerate(flipkart_products):
-        fk_data.append({
-            'idx': idx,
-            'p': fk_p,
-            'embedding': fk_embeddings[idx],
-            'identifiers': extract_key_identifiers(fk_p['title']),
-            'words': set(normalize_title(fk_p['title']).split())
-        })
+    print(f"[AI] Encoding {len(amz_titles)} Amazon + {len(fk_titles)} Flipkart products...")
+    with ThreadPoolExecutor(max_workers=1) as encoder:
+        encode_future = encoder.submit(_encode_titles, model, amz_titles + fk_titles)
+
+        # 2. Pre-calculate Amazon and Flipkart Identifiers
+        # (columns parallel to the product lists; row i of every array is product i)
+        amz_identifiers = [extract_key_identifiers(t) for t in amz_titles]
+        fk_identifiers = [extract_key_identifiers(t) for t in fk_titles]
+
+        all_embeddings = encode_future.result()
+    amz_embeddings = all_embeddings[:len(amz_titles)]
+    fk_embeddings = all_embeddings[len(amz_titles):]
 
     # 3. Batch compute all cosine similarities (GPU accelerated)
     # Resulting matrix shape: [len(amz), len(fk)]
-    cosine_scores = util.cos_sim(amz_embeddings, fk_embeddings)
-
-    # 4. Perform matching with conflict detection
-    for i, amz in enumerate(amz_data):
-        amz_product = amz['p']
-        amz_ids = amz['identifiers']
-        
-        # Determine Category
-        amz_cat = 'general'
-        if any(x.endswith('inch') for x in amz_ids) or any(x in amz_ids for x in ['4k', 'fhd', 'hd']):
-            amz_cat = 'tv'
-        elif any(x.startswith('storage_') for x in amz_ids) and any(x in amz_ids for x in ['apple', 'samsung', 'oneplus', 'xiaomi', 'redmi', 'realme', 'oppo', 'vivo', 'poco', 'motorola']):
-            amz_cat = 'mobile'
-        elif any(x.startswith('watt_') for x in amz_ids) or any(x.startswith('jars_') for x in amz_ids):
-            amz_cat = 'appliance'
+    cosine_scores = _cosine_matrix(amz_embeddings, fk_embeddings)
+
+    # 4. Score every pair at once; vetoed or low-confidence pairs are marked invalid
+    amz_masks, fk_masks, family_masks = _build_identifier_masks(amz_identifiers, fk_identifiers)
+    semantic = cosine_scores.cpu().numpy().astype(np.float64)
+
+    # Only rows/columns with at least one pair above the semantic floor can match;
+    # score that sub-grid and leave everything else invalid
+    above_floor = semantic > _SEMANTIC_FLOOR
+    rows = np.flatnonzero(above_floor.any(axis=1))
+    cols = np.flatnonzero(above_floor.any(axis=0))
+    pair_scores = np.zeros(semantic.shape)
+    pair_valid = np.zeros(semantic.shape, dtype=bool)
+    if rows.size:
+        grid = np.ix_(rows, cols)
+        pair_scores[grid], pair_valid[grid] = _score_candidate_pairs(
+            amz_masks[rows], fk_masks[cols], family_masks, semantic[grid]
+        )
 
+    # 5. 1-to-1 assignment on the score matrix, best pairs first
+    # Rows go straight into matched (both prices) or unmatched, so the final order needs no re-filtering
+    matched = []
+    unmatched = []
+    assignments = _assign_pairs(pair_scores, pair_valid)
+    for i, amz_product in enumerate(amazon_products):
         best_match = None
         best_score = 0
-        best_idx = -1
-        
-        for j, fk in enumerate(fk_data):
-            if fk['idx'] in used_flipkart:
-                continue
-            
-            fk_ids = fk['identifiers']
-            semantic_score = float(cosine_scores[i][j])
-            
-            # --- VETO LOGIC (100% Fatal Conflicts) ---
-            
-            # 1. Accessory vs Main Product Conflict
-            if amz_ids.intersection({'flag_accessory', 'flag_main_product'}) != fk_ids.intersection({'flag_accessory', 'flag_main_product'}):
-                continue
-
-            # 2. Refurbished vs New Conflict
-            if amz_ids.intersection({'flag_refurbished', 'flag_new'}) != fk_ids.intersection({'flag_refurbished', 'flag_new'}):
-                continue
-            
-            # 3. Brand Conflict
-            amz_brands = {x for x in amz_ids if not x.startswith(('brandfamily_', 'flag_', 'unit_', 'watt_', 'jars_', 'appmodel_', 'storage_', 'ram_', 'series_', 'model_', 'color_', 'variant_', 'iphone_gen_')) and x in SUPPORTED_BRANDS}
-            fk_brands = {x for x in fk_ids if not x.startswith(('brandfamily_', 'flag_', 'unit_', 'watt_', 'jars_', 'appmodel_', 'storage_', 'ram_', 'series_', 'model_', 'color_', 'variant_', 'iphone_gen_')) and x in SUPPORTED_BRANDS}
-            
-            brand_conflict = False
-            if amz_brands and fk_brands:
-                # Check for explicit brand overlap
-                if not amz_brands.intersection(fk_brands):
-                    # Check for brand family overlap (e.g. Mi belongs to Xiaomi)
-                    amz_families = {x for x in amz_ids if x.startswith('brandfamily_')}
-                    fk_families = {x for x in fk_ids if x.startswith('brandfamily_')}
-                    if not amz_families.intersection(fk_families):
-                        continue # Hard brand mismatch
-
-            # 4. Storage Conflict (Strict for Mobiles)
-            amz_storage = {x for x in amz_ids if x.startswith('storage_')}
-            fk_storage = {x for x in fk_ids if x.startswith('storage_')}
-            if amz_storage and fk_storage and amz_storage != fk_storage:
-                continue
-
-            # 5. Quantity/Unit Conflict
-            amz_units = {x for x in amz_ids if x.startswith('unit_')}
-            fk_units = {x for x in fk_ids if x.startswith('unit_')}
-            if amz_units and fk_units and amz_units != fk_units:
-                continue
 
-            # 6. Category Specific Vetoes
-            if amz_cat == 'tv':
-                # Screen size match
-                amz_sizes = {x for x in amz_ids if x.endswith('inch')}
-                fk_sizes = {x for x in fk_ids if x.endswith('inch')}
-                if amz_sizes and fk_sizes and amz_sizes != fk_sizes:
-                    continue
-                # Resolution match
-                amz_res = amz_ids.intersection({'4k', 'fhd', 'hd'})
-                fk_res = fk_ids.intersection({'4k', 'fhd', 'hd'})
-                if amz_res and fk_res and amz_res != fk_res:
-                    continue
-            
-            if amz_cat == 'appliance':
-                # Wattage match
-                amz_watt = {x for x in amz_ids if x.startswith('watt_')}
-                fk_watt = {x for x in fk_ids if x.startswith('watt_')}
-                if amz_watt and fk_watt and amz_watt != fk_watt:
-                    continue
-                # Jar count match
-                amz_jars = {x for x in amz_ids if x.startswith('jars_')}
-                fk_jars = {x for x in fk_ids if x.startswith('jars_')}
-                if amz_jars and fk_jars and amz_jars != fk_jars:
-                    continue
-
-            # 7. Series/Variant Conflict
-            amz_series = {x for x in amz_ids if x.startswith('series_')}
-            fk_series = {x for x in fk_ids if x.startswith('series_')}
-            if amz_series and fk_series and amz_series != fk_series:
-                continue
-
-            # 8. Strict variant conflict (especially important for phones/laptops)
-            amz_variants = {x.replace('variant_', '') for x in amz_ids if x.startswith('variant_')}
-            fk_variants = {x.replace('variant_', '') for x in fk_ids if x.startswith('variant_')}
-            amz_strict_variants = amz_variants.intersection(STRICT_VARIANTS)
-            fk_strict_variants = fk_variants.intersection(STRICT_VARIANTS)
-            if amz_strict_variants and fk_strict_variants and not amz_strict_variants.intersection(fk_strict_variants):
-                continue
-
-            # 9. iPhone generation mismatch (e.g., iPhone 16 vs iPhone 17)
-            amz_iphone_gen = {x for x in amz_ids if x.startswith('iphone_gen_')}
-            fk_iphone_gen = {x for x in fk_ids if x.startswith('iphone_gen_')}
-            if amz_iphone_gen and fk_iphone_gen and amz_iphone_gen != fk_iphone_gen:
-                continue
-
-            # --- DYNAMIC SCORING ---
-            score = semantic_score
-            
-            # Boost for shared identifiers
-            overlap_count = len(amz_ids & fk_ids)
-            score += (overlap_count * 0.05)
-            
-            # Boost for brand match
-            brand_match = bool(amz_brands.intersection(fk_brands))
-            if brand_match:
-                score += 0.15
-            
-            # Boost for model match
-            amz_models = {x for x in amz_ids if x.startswith('model_')}
-            fk_models = {x for x in fk_ids if x.startswith('model_')}
-            if amz_models and fk_models and amz_models.intersection(fk_models):
-                score += 0.4 # Significant boost
-                
-            # Penalty for color mismatch (not a veto)
-            amz_colors = {x for x in amz_ids if x.startswith('color_')}
-            fk_colors = {x for x in fk_ids if x.startswith('color_')}
-            if amz_colors and fk_colors and amz_colors != fk_colors:
-                score -= 0.2
-
-            # Final Decision based on confidence levels
-            is_valid = False
-            
-            # Level 1: Extremely high confidence (Model match OR Brand+Storage+Series)
-            if amz_models and fk_models and amz_models.intersection(fk_models) and semantic_score > 0.4:
-                is_valid = True
-            # Level 2: High overlap + decent semantic
-            elif brand_match and overlap_count >= 4 and semantic_score > 0.55:
-                is_valid = True
-            # Level 3: Pure semantic (needs to be very high for electronics)
-            elif semantic_score > 0.82:
-                is_valid = True
-            
-            if is_valid and score > best_score:
-                best_score = score
-                best_match = fk['p']
-                best_idx = fk['idx']
+        if i in assignments:
+            j, best_score = assignments[i]
+            best_match = flipkart_products[j]
+            used_flipkart.add(j)
         
         unified = {
-            "id": len(unified_products) + 1,
+            "id": None,
             "title": amz_product['title'],
             "image": amz_product['image'],
             "rating": amz_product['rating'],
@@ -1280,16 +1608,16 @@ def match_products(amazon_products, flipkart_products):
             "match_confidence": round(best_score, 2) if best_match else 0
         }
         
-        if best_match:
-            used_flipkart.add(best_idx)
-        
-        unified_products.append(unified)
+        if unified['amazon_price'] and unified['flipkart_price']:
+            matched.append(unified)
+        else:
+            unmatched.append(unified)
     
     # Add unmatched Flipkart products
     for idx, fk_product in enumerate(flipkart_products):
         if idx not in used_flipkart:
-            unified_products.append({
-                "id": len(unified_products) + 1,
+            unmatched.append({
+                "id": None,
                 "title": fk_product['title'],
                 "image": fk_product['image'],
                 "rating": fk_product['rating'],
@@ -1301,146 +1629,239 @@ def match_products(amazon_products, flipkart_products):
                 "match_confidence": 0
             })
     
-    # Sort: matched products (with both prices) first, then unmatched
-    matched = [p for p in unified_products if p['amazon_price'] and p['flipkart_price']]
-    unmatched = [p for p in unified_products if not (p['amazon_price'] and p['flipkart_price'])]
-    
-    # Re-assign IDs after sorting
+    # Matched products (with both prices) first, then unmatched; assign IDs in that order
     sorted_products = matched + unmatched
     for i, product in enumerate(sorted_products):
         product['id'] = i + 1
-        product['has_comparison'] = bool(product['amazon_price'] and product['flipkart_price'])
+        product['has_comparison'] = i < len(matched)
     
     return sorted_products
 
 
+# Containers whose presence means a detail page has rendered its specs
+AMAZON_DETAIL_SELECTOR = (
+    "#productDetails_techSpec_section_1, #productDetails_detailBullets_sections1, "
+    "#detailBullets_feature_div, #feature-bullets"
+)
+FLIPKART_DETAIL_SELECTOR = "div._14cfVK, div.GNDEQ-, div._3k-BhJ, div.X3BRps, div._3dtsli, li._2RngUh, li._21lJbe"
+
+# lxml builds the soup far faster than html.parser on ~1MB product pages; fall back if it isn't installed
+try:
+    import lxml  # noqa: F401
+    DETAIL_HTML_PARSER = "lxml"
+except ImportError:
+    DETAIL_HTML_PARSER = "html.parser"
+
+# Plain-HTTP detail fetch; falls back to Selenium when fewer specs than this are found
+DETAIL_HTTP_FAST_PATH = os.getenv("SCRAPER_DETAIL_HTTP", "true").lower() == "true"
+DETAIL_HTTP_MIN_SPECS = int(os.getenv("SCRAPER_DETAIL_HTTP_MIN_SPECS", "3"))
+
+# Idle detail-page drivers kept warm between scrape_product_details calls
+DETAIL_DRIVER_POOL_SIZE = int(os.getenv("SCRAPER_DETAIL_DRIVER_POOL_SIZE", "2"))
+_DETAIL_DRIVER_POOL = queue.Queue(maxsize=max(DETAIL_DRIVER_POOL_SIZE, 0))
+
+
+def _acquire_detail_driver():
+    """Take an idle driver from the pool, or start a new one."""
+    try:
+        return _DETAIL_DRIVER_POOL.get_nowait()
+    except queue.Empty:
+        driver = get_chrome_driver()
+        driver.set_page_load_timeout(15)
+        return driver
+
+
+def _release_detail_driver(driver, healthy=True):
+    """Return a driver to the pool; quit it if it errored or the pool is full."""
+    if healthy and DETAIL_DRIVER_POOL_SIZE > 0:
+        try:
+            _DETAIL_DRIVER_POOL.put_nowait(driver)
+            return
+        except queue.Full:
+            pass
+    try:
+        driver.quit()
+    except:
+        pass
+
+
+@atexit.register
+def _shutdown_detail_drivers():
+    while True:
+        try:
+            driver = _DETAIL_DRIVER_POOL.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            driver.quit()
+        except:
+            pass
+
+
+def _parse_product_specs(soup, url):
+    """Extract specification key-value pairs from a parsed Amazon or Flipkart product page."""
+    specs = {}
+
+    if "amazon" in url.lower():
+        # Amazon Product Details
+        
+        # Method 1: Technical Details table (#productDetails_techSpec_section_1)
+        tech_table = soup.find('table', {'id': 'productDetails_techSpec_section_1'})
+        if tech_table:
+            for row in tech_table.find_all('tr'):
+                th = row.find('th')
+                td = row.find('td')
+                if th and td:
+                    key = th.get_text(strip=True)
+                    val = td.get_text(strip=True)
+                    if key and val:
+                        specs[key] = val
+        
+        # Method 2: Additional Info table (#productDetails_detailBullets_sections1)
+        detail_table = soup.find('table', {'id': 'productDetails_detailBullets_sections1'})
+        if detail_table:
+            for row in detail_table.find_all('tr'):
+                th = row.find('th')
+                td = row.find('td')
+                if th and td:
+                    key = th.get_text(strip=True)
+                    val = td.get_text(strip=True)
+                    if key and val and key not in specs:
+                        specs[key] = val
+        
+        # Method 3: Detail Bullets (#detailBullets_feature_div)
+        bullets_div = soup.find('div', {'id': 'detailBullets_feature_div'})
+        if bullets_div:
+            for li in bullets_div.find_all('li'):
+                spans = li.find_all('span', class_='a-list-item')
+                for span in spans:
+                    text = span.get_text(strip=True)
+                    if ':' in text or '\u200f' in text:
+                        parts = re.split(r'[:\u200f]', text, 1)
+                        if len(parts) == 2:
+                            key = parts[0].strip().strip('\u200e')
+                            val = parts[1].strip().strip('\u200e')
+                            if key and val and key not in specs:
+                                specs[key] = val
+        
+        # Method 4: Feature bullets (#feature-bullets)
+        feature_div = soup.find('div', {'id': 'feature-bullets'})
+        if feature_div:
+            features = []
+            for li in feature_div.find_all('li'):
+                text = li.get_text(strip=True)
+                if text and len(text) > 5:
+                    features.append(text)
+            if features:
+                specs['Key Features'] = ' | '.join(features[:6])
+        
+        # Product description
+        desc = soup.find('div', {'id': 'productDescription'})
+        if desc:
+            desc_text = desc.get_text(strip=True)[:300]
+            if desc_text:
+                specs['Description'] = desc_text
+                
+    elif "flipkart" in url.lower():
+        # Flipkart Product Details
+        
+        # Method 1: Specification tables (_14cfVK or _3Fm-hO pattern)
+        spec_divs = soup.find_all('div', class_=re.compile(r'_14cfVK|GNDEQ-|_3k-BhJ'))
+        if not spec_divs:
+            # Try alternative class patterns
+            spec_divs = soup.find_all('div', class_=re.compile(r'X3BRps|_3dtsli'))
+        
+        for div in spec_divs:
+            rows = div.find_all('tr', class_=re.compile(r'_1s_Smc|WJdYP6|row'))
+            if not rows:
+                rows = div.find_all('tr')
+            for row in rows:
+                tds = row.find_all('td')
+                if len(tds) >= 2:
+                    key = tds[0].get_text(strip=True)
+                    val_el = tds[1].find('li') or tds[1]
+                    val = val_el.get_text(strip=True)
+                    if key and val:
+                        specs[key] = val
+        
+        # Method 2: Key Specs section (often _2RngUh or _2418kt)
+        key_specs = soup.find_all('li', class_=re.compile(r'_2RngUh|_21lJbe'))
+        if key_specs:
+            features = [li.get_text(strip=True) for li in key_specs if li.get_text(strip=True)]
+            if features:
+                specs['Highlights'] = ' | '.join(features[:6])
+
+        # Method 3: Read more description
+        desc_div = soup.find('div', class_=re.compile(r'_1mXcCf|_2o0sEQ'))
+        if desc_div:
+            desc_text = desc_div.get_text(strip=True)[:300]
+            if desc_text:
+                specs['Description'] = desc_text
+
+    return specs
+
+
+def _fetch_product_details_http(url):
+    """
+    Fetch a product page with plain HTTP (no browser) and parse its specs.
+    Returns {} on errors or bot-check pages so the caller can fall back to Selenium.
+    """
+    try:
+        resp = get_http_session().get(url, timeout=DEFAULT_HTTP_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        if SCRAPER_VERBOSE:
+            print(f"[DETAIL SCRAPE][HTTP] error: {e}")
+        return {}
+    if resp.status_code != 200:
+        if SCRAPER_VERBOSE:
+            print(f"[DETAIL SCRAPE][HTTP] status={resp.status_code}, falling back to browser")
+        return {}
+    return _parse_product_specs(BeautifulSoup(resp.text, DETAIL_HTML_PARSER), url)
+
+
 def scrape_product_details(url):
     """
     Scrape detailed product specifications from an individual Amazon or Flipkart product page.
-    Uses Selenium to handle JavaScript-rendered content.
+    Tries a plain HTTP fetch first (many pages ship their specs in the initial HTML) and
+    only uses Selenium for JavaScript-rendered pages; drivers are reused across calls.
     Returns a dict of specification key-value pairs.
     """
     if not url:
         return {}
     
+    if DETAIL_HTTP_FAST_PATH:
+        specs = _fetch_product_details_http(url)
+        if len(specs) >= DETAIL_HTTP_MIN_SPECS:
+            print(f"[DETAIL SCRAPE] Found {len(specs)} specs from {url[:50]}... (http)")
+            return specs
+    
     driver = None
+    healthy = True
     specs = {}
     
     try:
-        driver = get_chrome_driver()
-        driver.set_page_load_timeout(15)
+        driver = _acquire_detail_driver()
         print(f"[DETAIL SCRAPE] Loading: {url[:80]}...")
         driver.get(url)
-        time.sleep(2)  # Let page render
+        # Wait for the spec blocks to render instead of sleeping a fixed 2s
+        spec_selector = AMAZON_DETAIL_SELECTOR if "amazon" in url.lower() else FLIPKART_DETAIL_SELECTOR
+        try:
+            WebDriverWait(driver, 2, poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, spec_selector))
+            )
+        except:
+            pass  # Parse whatever rendered
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        if "amazon" in url.lower():
-            # Amazon Product Details
-            
-            # Method 1: Technical Details table (#productDetails_techSpec_section_1)
-            tech_table = soup.find('table', {'id': 'productDetails_techSpec_section_1'})
-            if tech_table:
-                for row in tech_table.find_all('tr'):
-                    th = row.find('th')
-                    td = row.find('td')
-                    if th and td:
-                        key = th.get_text(strip=True)
-                        val = td.get_text(strip=True)
-                        if key and val:
-                            specs[key] = val
-            
-            # Method 2: Additional Info table (#productDetails_detailBullets_sections1)
-            detail_table = soup.find('table', {'id': 'productDetails_detailBullets_sections1'})
-            if detail_table:
-                for row in detail_table.find_all('tr'):
-                    th = row.find('th')
-                    td = row.find('td')
-                    if th and td:
-                        key = th.get_text(strip=True)
-                        val = td.get_text(strip=True)
-                        if key and val and key not in specs:
-                            specs[key] = val
-            
-            # Method 3: Detail Bullets (#detailBullets_feature_div)
-            bullets_div = soup.find('div', {'id': 'detailBullets_feature_div'})
-            if bullets_div:
-                for li in bullets_div.find_all('li'):
-                    spans = li.find_all('span', class_='a-list-item')
-                    for span in spans:
-                        text = span.get_text(strip=True)
-                        if ':' in text or '\u200f' in text:
-                            parts = re.split(r'[:\u200f]', text, 1)
-                            if len(parts) == 2:
-                                key = parts[0].strip().strip('\u200e')
-                                val = parts[1].strip().strip('\u200e')
-                                if key and val and key not in specs:
-                                    specs[key] = val
-            
-            # Method 4: Feature bullets (#feature-bullets)
-            feature_div = soup.find('div', {'id': 'feature-bullets'})
-            if feature_div:
-                features = []
-                for li in feature_div.find_all('li'):
-                    text = li.get_text(strip=True)
-                    if text and len(text) > 5:
-                        features.append(text)
-                if features:
-                    specs['Key Features'] = ' | '.join(features[:6])
-            
-            # Product description
-            desc = soup.find('div', {'id': 'productDescription'})
-            if desc:
-                desc_text = desc.get_text(strip=True)[:300]
-                if desc_text:
-                    specs['Description'] = desc_text
-                    
-        elif "flipkart" in url.lower():
-            # Flipkart Product Details
-            
-            # Method 1: Specification tables (_14cfVK or _3Fm-hO pattern)
-            spec_divs = soup.find_all('div', class_=re.compile(r'_14cfVK|GNDEQ-|_3k-BhJ'))
-            if not spec_divs:
-                # Try alternative class patterns
-                spec_divs = soup.find_all('div', class_=re.compile(r'X3BRps|_3dtsli'))
-            
-            for div in spec_divs:
-                rows = div.find_all('tr', class_=re.compile(r'_1s_Smc|WJdYP6|row'))
-                if not rows:
-                    rows = div.find_all('tr')
-                for row in rows:
-                    tds = row.find_all('td')
-                    if len(tds) >= 2:
-                        key = tds[0].get_text(strip=True)
-                        val_el = tds[1].find('li') or tds[1]
-                        val = val_el.get_text(strip=True)
-                        if key and val:
-                            specs[key] = val
-            
-            # Method 2: Key Specs section (often _2RngUh or _2418kt)
-            key_specs = soup.find_all('li', class_=re.compile(r'_2RngUh|_21lJbe'))
-            if key_specs:
-                features = [li.get_text(strip=True) for li in key_specs if li.get_text(strip=True)]
-                if features:
-                    specs['Highlights'] = ' | '.join(features[:6])
-
-            # Method 3: Read more description
-            desc_div = soup.find('div', class_=re.compile(r'_1mXcCf|_2o0sEQ'))
-            if desc_div:
-                desc_text = desc_div.get_text(strip=True)[:300]
-                if desc_text:
-                    specs['Description'] = desc_text
+        specs = _parse_product_specs(BeautifulSoup(driver.page_source, DETAIL_HTML_PARSER), url)
         
         print(f"[DETAIL SCRAPE] Found {len(specs)} specs from {url[:50]}...")
         
     except Exception as e:
+        healthy = False
         print(f"[DETAIL SCRAPE] Error scraping {url[:60]}: {e}")
     finally:
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            _release_detail_driver(driver, healthy)
     
     return specs
 
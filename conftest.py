@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the scraper debug tests.
+One browser is started per pytest session and reused by every test that asks
+for `driver`; cookies are cleared between tests instead of relaunching.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'backend')))
+
+
+@pytest.fixture(scope="session")
+def browser():
+    from scraper import get_chrome_driver
+    try:
+        d = get_chrome_driver()
+    except Exception as e:
+        pytest.skip(f"Browser unavailable: {e}")
+    yield d
+    d.quit()
+
+
+@pytest.fixture
+def driver(browser):
+    browser.delete_all_cookies()
+    return browser
@@ -1,4 +1,7 @@
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
 mapping = {
     # Old pure black palette
@@ -18,25 +21,24 @@ mapping = {
     '#2D3526': '#222B18'
 }
 
+# One pass per file: any old color followed by ], " or ; (i.e. likely a hex color ending a class or string)
+color_pattern = re.compile(
+    '(' + '|'.join(re.escape(old) for old in sorted(mapping, key=len, reverse=True)) + r')([\]";])'
+)
+
 def replace_in_file(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    original = content
-    for old, new in mapping.items():
-        # Replace only if it's likely a hex color (e.g., ends a class or string)
-        content = content.replace(f'{old}]', f'{new}]')
-        content = content.replace(f'{old}"', f'{new}"')
-        content = content.replace(f'{old};', f'{new};')
-        
-    if content != original:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    path = Path(filepath)
+    content, count = color_pattern.subn(lambda m: mapping[m.group(1)] + m.group(2), path.read_text(encoding='utf-8'))
+    if count:
+        path.write_text(content, encoding='utf-8')
         print(f"Updated {filepath}")
 
-for root, _, files in os.walk('c:/Developer/Code/webdev/shopsync/frontend/src/components'):
-    for file in files:
-        if file.endswith('.jsx'):
-            replace_in_file(os.path.join(root, file))
-            
-replace_in_file('c:/Developer/Code/webdev/shopsync/frontend/src/App.jsx')
+if __name__ == '__main__':
+    # Guarded so worker processes (spawned on Windows) can re-import mapping without re-running the scan
+    paths = list(Path('c:/Developer/Code/webdev/shopsync/frontend/src/components').rglob('*.jsx'))
+    paths.append(Path('c:/Developer/Code/webdev/shopsync/frontend/src/App.jsx'))
+    # Split the files evenly so every worker gets some; a fixed chunksize larger than
+    # the file count would hand them all to a single worker
+    workers = max(1, min(len(paths), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(replace_in_file, paths, chunksize=max(1, len(paths) // workers)))
@@ -2,25 +2,107 @@
 Debug script to understand why Flipkart scraper returns 0 results.
 Dumps detailed info about the page state.
 """
-import sys, os, time, re
+import sys, os, re
+from itertools import islice
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'backend')))
 
 from scraper import get_chrome_driver, parse_price
 from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 
-driver = None
-try:
-    driver = get_chrome_driver()
+PRICE_RE = re.compile(r'₹[0-9,]+')
+PROD_RE = re.compile(r'/p/')
+PID_RE = re.compile(r'pid=([A-Z0-9]+)')
+
+
+def canonical_href(href):
+    """Short dedupe key for a product link: its pid, else the path without tracking params."""
+    m = PID_RE.search(href)
+    return m.group(1) if m else href.split('?')[0]
+
+
+def wait_until_settled(driver, timeout=2):
+    """Wait until the document has loaded and its scroll height stops changing."""
+    last_height = [None]
+
+    def settled(d):
+        height = d.execute_script(
+            "return document.readyState === 'complete' ? document.body.scrollHeight : -1"
+        )
+        stable = height != -1 and height == last_height[0]
+        last_height[0] = height
+        return stable
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(settled)
+    except:
+        pass  # Keep going with whatever has rendered
+
+
+# Smallest element holding every product link (the results grid), or the whole body
+# when there are none, e.g. on a captcha page
+RESULTS_HTML_JS = """
+const links = document.querySelectorAll('a[href*="/p/"]');
+if (!links.length) return document.body.outerHTML;
+let node = links[0];
+const last = links[links.length - 1];
+while (!node.contains(last)) node = node.parentElement;
+return node.outerHTML;
+"""
+
+
+def find_card(a, max_levels=6):
+    """Nearest ancestor div of `a` with at least 3 element children, or None."""
+    for parent in islice(a.parents, max_levels):
+        if parent.name == 'body':
+            break
+        if parent.name == 'div' and len(parent.find_all(recursive=False)) >= 3:
+            return parent
+    return None
+
+
+def scroll_incrementally(driver, step=500, max_steps=80):
+    """
+    Scroll down `step` px at a time so lazy-loaded tiles render, stopping once the
+    bottom is reached and the page height has stopped growing for two checks.
+    """
+    unchanged = 0
+    for _ in range(max_steps):
+        at_bottom = driver.execute_script(
+            "window.scrollBy(0, arguments[0]);"
+            "return window.innerHeight + window.pageYOffset >= document.body.scrollHeight;",
+            step,
+        )
+        if not at_bottom:
+            continue
+        height = driver.execute_script("return document.body.scrollHeight")
+        wait_until_settled(driver, timeout=1)
+        if driver.execute_script("return document.body.scrollHeight") == height:
+            unchanged += 1
+            if unchanged >= 2:
+                break
+        else:
+            unchanged = 0
+
+
+def test_debug_flipkart(driver):
+    """Dump page-state diagnostics for a live Flipkart search (driver comes from conftest.py)."""
     url = "https://www.flipkart.com/search?q=lenovo"
     print(f"[1] Loading: {url}")
     driver.get(url)
     
-    # Wait longer
-    print("[2] Waiting 6 seconds for page load...")
-    time.sleep(6)
+    # Wait for the product grid instead of a fixed sleep
+    print("[2] Waiting up to 8 seconds for product links...")
+    try:
+        WebDriverWait(driver, 8).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="/p/"]'))
+        )
+    except:
+        print("[2] No product links yet, continuing with what rendered")
     
     # Try closing login popup
-    from selenium.webdriver.common.by import By
     try:
         close_btn = driver.find_element(By.CSS_SELECTOR, "button._2KpZ6l._2doB4z, span._30XB9F")
         close_btn.click()
@@ -29,22 +111,20 @@ try:
         print("[3] No login popup found")
     
     # Scroll to trigger lazy loading
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(0.5)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(0.5)
+    scroll_incrementally(driver)
     
-    html = driver.page_source
-    print(f"[4] HTML length: {len(html)} bytes")
+    # Only the results grid crosses the WebDriver channel, not the whole serialized page
+    html = driver.execute_script(RESULTS_HTML_JS)
+    print(f"[4] Results HTML length: {len(html)} bytes")
     
-    # Save for inspection
+    # Save the results grid for inspection
     with open("flipkart_debug.html", "w", encoding="utf-8") as f:
         f.write(html)
     
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
     
     # Check for bot detection / captcha
-    title = soup.title.string if soup.title else "No title"
+    title = driver.title or "No title"
     print(f"[5] Page title: {title}")
     
     # Check for common block indicators
@@ -52,11 +132,11 @@ try:
         print("[!] CAPTCHA or robot check detected!")
     
     # Count all links
-    all_links = soup.find_all('a', href=True)
-    print(f"[6] Total links on page: {len(all_links)}")
+    all_links = driver.execute_script("return document.querySelectorAll('a[href]').length")
+    print(f"[6] Total links on page: {all_links}")
     
     # Count product links specifically
-    product_links = soup.find_all('a', href=re.compile(r'/p/'))
+    product_links = soup.find_all('a', href=PROD_RE)
     print(f"[7] Links containing '/p/': {len(product_links)}")
     
     # Show first 5 product link hrefs
@@ -69,7 +149,10 @@ try:
     seen = set()
     for a in product_links:
         href = a.get('href')
-        if not href or href in seen:
+        if not href:
+            continue
+        key = canonical_href(href)
+        if key in seen:
             continue
         
         text = a.get_text(strip=True)
@@ -82,31 +165,34 @@ try:
         if not title:
             continue
         
-        # Look for price
+        # Look for price in the product card: the nearest ancestor div (6 levels max)
+        # with 3+ element children, scanned once instead of once per ancestor level
         price = None
-        curr = a
-        for _ in range(6):
-            if not curr or curr.name == 'body':
-                break
-            price_texts = curr.find_all(string=re.compile(r'₹[0-9,]+'))
-            if price_texts:
-                for pt in price_texts:
-                    parsed = parse_price(str(pt).strip())
+        card = find_card(a)
+        if card:
+            # stripped_strings is lazy, so the walk stops at the first price instead of
+            # collecting every match in the card; the regex only runs on strings with '₹'
+            for pt in card.stripped_strings:
+                if '₹' in pt and PRICE_RE.search(pt):
+                    parsed = parse_price(pt)
                     if parsed:
                         price = parsed
                         break
-            if price:
-                break
-            curr = curr.parent
         
         if title and price:
             products_found += 1
-            seen.add(href)
+            seen.add(key)
             if products_found <= 3:
                 print(f"[8] Product: {title[:50]}... | ₹{price}")
     
     print(f"\n[RESULT] Found {products_found} products total")
-    
-finally:
-    if driver:
+    assert product_links, "no '/p/' product links on the page (blocked or not rendered)"
+    assert products_found, "product links found but no title/price could be parsed from them"
+
+
+if __name__ == "__main__":
+    driver = get_chrome_driver()
+    try:
+        test_debug_flipkart(driver)
+    finally:
         driver.quit()
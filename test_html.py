@@ -1,71 +1,193 @@
-from bs4 import BeautifulSoup
+from lxml import etree
 import re
 import json
+import hashlib
+import pickle
 
-print("Testing Robust Scraping...")
-with open("flipkart_dump.html", "r", encoding="utf-8") as f:
-    soup = BeautifulSoup(f.read(), "html.parser")
+PRICE_RE = re.compile(r'₹[0-9,]+')
+PID_RE = re.compile(r'pid=([A-Z0-9]+)')
+
+DUMP_PATH = "flipkart_dump.html"
+# Pre-extracted link data, reused while the dump is unchanged.
+# Bump CACHE_VERSION whenever extract_links() changes what it records.
+CACHE_PATH = "flipkart_dump.cache.pkl"
+CACHE_VERSION = 4
+
+# XPath expressions compiled once at import and reused on every node, instead of
+# element.xpath() recompiling the same expression on each call
+ALL_TEXT = etree.XPath('.//text()')
+PRICE_TEXT = etree.XPath('.//text()[contains(., "₹")]')
+PRODUCT_LINKS = etree.XPath('.//a[contains(@href, "/p/")]')
+CHILD_DIVS = etree.XPath('.//div')
+ELEMENT_CHILD_COUNT = etree.XPath('count(*)')
+
+
+def text_of(node):
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    return ''.join(s.strip() for s in ALL_TEXT(node))
+
+
+def text_parent(text_node):
+    """Element that contains an XPath text node (tail text belongs to the tag's parent)."""
+    parent = text_node.getparent()
+    return parent if text_node.is_text else parent.getparent()
+
+
+def canonical_href(href):
+    """Short dedupe key for a product link: its pid, else the path without tracking params."""
+    m = PID_RE.search(href)
+    return m.group(1) if m else href.split('?')[0]
 
-products = []
-# Best way to find flipkart products is looking for links that match /p/ 
+
+# Best way to find flipkart products is looking for links that match /p/
 # and have a title or an image and a price nearby.
-links = soup.select('a[href*="/p/"]')
-
-seen_links = set()
-
-for a in links:
-    href = a.get('href')
-    if href in seen_links: continue
-    
-    # Needs to be a substantial link, not just a tiny fragment
-    text = a.get_text(strip=True)
-    title = None
-    
-    # 1. Is this link the title itself?
-    if len(text) > 15:
-         title = text
-    # 2. Or does it have a title attribute?
-    elif a.get('title') and len(a.get('title')) > 15:
-         title = a.get('title')
-    # 3. Does it contain a child div with the title?
-    else:
-         child_divs = a.find_all('div')
-         for d in child_divs:
-              t = d.get_text(strip=True)
-              if len(t) > 15 and not t.startswith('₹'):
-                   title = t
-                   break
-
-    if not title: continue
-    
-    # Look for price in the parent tree
-    price = None
-    curr = a
-    for _ in range(5): # Go up 5 levels max
-        if not curr: break
-        
-        # Look for the characteristic Rupee symbol in any child
-        price_texts = curr.find_all(string=re.compile(r'₹[0-9,]+'))
-        if price_texts:
-             for pt in price_texts:
-                  # Ensure it's not the original price (strikethrough)
-                  parent_classes = pt.parent.get('class', [])
-                  if parent_classes and any('strikethrough' in c.lower() or 'discount' in c.lower() for c in parent_classes):
-                       continue
-                  # Usually the current price is the first one or largest one
-                  price = pt.strip()
-                  break
-        
-        if price: break
-        curr = curr.parent
-
-    if title and price:
-         products.append({
-             'title': title,
-             'price': price,
-             'link': href[:30] + '...'
-         })
-         seen_links.add(href)
+# A link's product card is its nearest ancestor div (5 levels max) with 3+ element children.
+CARD_MAX_DEPTH = 5
+
+
+def within_card(a, card):
+    """True when `card` is one of the first CARD_MAX_DEPTH ancestors of `a`."""
+    node = a
+    for _ in range(CARD_MAX_DEPTH):
+        node = node.getparent()
+        if node is None:
+            return False
+        if node is card:
+            return True
+    return False
+
+
+def iter_cards(source):
+    """
+    Stream the dump and yield (card, links) as each product card's closing tag is parsed.
+    Cards close before any div around them, so a link still in the tree when a div
+    closes has no nearer card. Cards are cleared once the caller has read them, so
+    they never pile up in memory.
+    """
+    for _, div in etree.iterparse(source, events=('end',), tag='div', html=True, encoding='utf-8'):
+        # len(div) would also count comments and processing instructions
+        if ELEMENT_CHILD_COUNT(div) < 3:
+            continue
+        links = [a for a in PRODUCT_LINKS(div) if within_card(a, div)]
+        if not links:
+            continue
+        yield div, links
+        div.clear(keep_tail=True)
+
+
+def extract_links(source):
+    """
+    Everything the heuristic reads from the page, per product link: its text, title
+    attribute, child div texts and the price strings in its product card, with
+    their parent's classes. Each card's prices are collected once and shared by
+    all of its links.
+    """
+    links = []
+    for card, card_links in iter_cards(source):
+        # Look for the characteristic Rupee symbol in any child; libxml2 drops text nodes
+        # without '₹' before they reach Python, so the regex only sees likely prices
+        card_prices = [
+            (t.strip(), text_parent(t).get('class', '').split())
+            for t in PRICE_TEXT(card) if PRICE_RE.search(t)
+        ]
+        for a in card_links:
+            links.append({
+                'href': a.get('href'),
+                'text': text_of(a),
+                'title': a.get('title'),
+                'div_texts': [text_of(d) for d in CHILD_DIVS(a)],
+                'card_prices': card_prices,
+            })
+    return links
+
+
+def file_digest(path):
+    """blake2b of the dump, read in chunks rather than all at once."""
+    h = hashlib.blake2b(str(CACHE_VERSION).encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_links(path):
+    """Return extract_links() for the dump, from the pickle cache when the dump's hash matches."""
+    key = file_digest(path)
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            cached = pickle.load(f)
+        if cached['key'] == key:
+            return cached['links']
+    except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+        pass
+    links = extract_links(path)
+    with open(CACHE_PATH, "wb") as f:
+        pickle.dump({'key': key, 'links': links}, f, protocol=5)
+    return links
+
+
+def is_struck_out(parent_classes):
+    """True for the original (strikethrough / discount) price next to the current one."""
+    return any('strikethrough' in c.lower() or 'discount' in c.lower() for c in parent_classes)
+
+
+def parse_products(links):
+    """
+    The robust title/price heuristic over extract_links() output. Kept in one function
+    so the per-link loop runs on fast local lookups instead of module globals.
+    """
+    products = []
+    seen_links = set()
+    seen_add = seen_links.add
+    append = products.append
+
+    for a in links:
+        href = a['href']
+        key = canonical_href(href)
+        if key in seen_links: continue
+
+        # Needs to be a substantial link, not just a tiny fragment
+        text = a['text']
+        title = None
+
+        # 1. Is this link the title itself?
+        if len(text) > 15:
+             title = text
+        # 2. Or does it have a title attribute?
+        elif a['title'] and len(a['title']) > 15:
+             title = a['title']
+        # 3. Does it contain a child div with the title?
+        else:
+             for t in a['div_texts']:
+                  if len(t) > 15 and not t.startswith('₹'):
+                       title = t
+                       break
+
+        if not title: continue
+
+        # Look for price in the product card
+        price = None
+        for pt, parent_classes in a['card_prices']:
+             # Ensure it's not the original price (strikethrough)
+             if parent_classes and is_struck_out(parent_classes):
+                  continue
+             # Usually the current price is the first one or largest one
+             price = pt
+             break
+
+        if title and price:
+             append({
+                 'title': title,
+                 'price': price,
+                 'link': href[:30] + '...'
+             })
+             seen_add(key)
+
+    return products
+
+
+print("Testing Robust Scraping...")
+products = parse_products(load_links(DUMP_PATH))
 
 print(f"Found {len(products)} products using robust heuristic.")
 for p in products[:5]:
@@ -1,7 +1,17 @@
 """
 End-to-end test of the updated scrape_flipkart function.
+
+By default the rendered search page is recorded once to .cache/flipkart/ and
+replayed from disk on later runs, so the parser can be iterated on offline.
+Set SCRAPE_LIVE=1 to run the full live scrape_flipkart instead, or
+SCRAPE_REFRESH=1 to re-record the cached page.
+Run with pytest to share the session browser from conftest.py, or directly.
 """
 import sys, os
+import hashlib
+import json
+import time
+from urllib.parse import urlsplit, parse_qsl, urlencode
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'backend')))
 
 # Force reimport
@@ -9,14 +19,101 @@ import importlib
 import scraper
 importlib.reload(scraper)
 
-from scraper import scrape_flipkart
-
-print("Testing scrape_flipkart('lenovo', max_results=10)...")
-results = scrape_flipkart("lenovo", max_results=10)
-print(f"\nFound {len(results)} results:")
-for i, r in enumerate(results):
-    print(f"  {i+1}. {r['title'][:55]:55s} | Rs.{r['price']}")
-    print(f"     Image: {str(r.get('image',''))[:50]}")
-    print(f"     Link:  {str(r.get('link',''))[:50]}")
-    print(f"     Rating: {r.get('rating')}")
-    print()
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from scraper import scrape_flipkart, get_chrome_driver, _extract_flipkart_products_from_soup
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'flipkart')
+# Query params that change between visits without changing the page
+VOLATILE_PARAMS = {'marketplace', '_r', 'otracker', 'otracker1', 'as', 'as-show', 'as-pos', 'as-type', 'sid', 'ts'}
+
+
+def normalize_url(url):
+    """Drop volatile query params and sort the rest so equivalent URLs share a cache entry."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in VOLATILE_PARAMS)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+
+
+def fetch_page_html(url, get_driver):
+    """
+    Return the rendered HTML for `url`, recording it with `get_driver()` on first use.
+    A page without any parseable product (half-rendered, empty grid, captcha) is not
+    cached, so it can't become the fixture every later run replays.
+    """
+    key = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()
+    html_path = os.path.join(CACHE_DIR, f"{key}.html")
+    if os.path.exists(html_path) and not os.getenv('SCRAPE_REFRESH'):
+        print(f"[replay] {url}")
+        with open(html_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    print(f"[record] {url}")
+    driver = get_driver()
+    try:
+        driver.get(url)
+    except Exception:
+        pass  # Page load timeout is OK - keep whatever loaded
+    # Same wait as the live scraper: the eager load returns before the grid renders
+    try:
+        WebDriverWait(driver, 8).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-id], a[href*='/p/']"))
+        )
+    except:
+        pass
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    html = driver.page_source
+
+    if not _extract_flipkart_products_from_soup(BeautifulSoup(html, 'html.parser'), 1):
+        raise RuntimeError(f"No Flipkart products on {url} (blocked or not rendered); page not cached")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    with open(os.path.join(CACHE_DIR, f"{key}.json"), 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'normalized_url': normalize_url(url), 'recorded_at': time.time()}, f, indent=2)
+    return html
+
+
+def replay_scrape_flipkart(query, max_results, get_driver):
+    url = f"https://www.flipkart.com/search?q={query.replace(' ', '+')}&page=1"
+    soup = BeautifulSoup(fetch_page_html(url, get_driver), 'html.parser')
+    return _extract_flipkart_products_from_soup(soup, max_results)
+
+
+def test_scrape_flipkart(request):
+    # The shared session browser (conftest.py) is only started when a page must be recorded
+    _run_scrape_flipkart(lambda: request.getfixturevalue('driver'))
+
+
+def _run_scrape_flipkart(get_driver):
+    print("Testing scrape_flipkart('lenovo', max_results=10)...")
+    if os.getenv('SCRAPE_LIVE'):
+        results = scrape_flipkart("lenovo", max_results=10)
+    else:
+        results = replay_scrape_flipkart("lenovo", max_results=10, get_driver=get_driver)
+    print(f"\nFound {len(results)} results:")
+    for i, r in enumerate(results):
+        print(f"  {i+1}. {r['title'][:55]:55s} | Rs.{r['price']}")
+        print(f"     Image: {str(r.get('image',''))[:50]}")
+        print(f"     Link:  {str(r.get('link',''))[:50]}")
+        print(f"     Rating: {r.get('rating')}")
+        print()
+    assert results, "no Flipkart products parsed"
+
+
+if __name__ == "__main__":
+    drivers = []
+
+    def get_driver():
+        if not drivers:
+            drivers.append(get_chrome_driver())
+        return drivers[0]
+
+    try:
+        _run_scrape_flipkart(get_driver)
+    finally:
+        for d in drivers:
+            d.quit()